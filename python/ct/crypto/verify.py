@@ -1,6 +1,6 @@
 """Verify CT log statements."""
 
-import io
+import logging
 import struct
 
 from ct.crypto import error
@@ -21,6 +21,16 @@ SUPPORTED_SIGNATURE_ALGORITHMS = (
     ct_pb2.DigitallySigned.RSA
 )
 
+# Precompiled TLS structures: the STH signature input
+# (version, signature type, timestamp, tree size, root hash), and the
+# DigitallySigned prefix (hash algorithm, signature algorithm, signature
+# length).
+_STH_INPUT = struct.Struct(">BBQQ32s")
+_SIG_PREFIX = struct.Struct(">BBH")
+
+# Shared by all LogVerifiers that are not given their own MerkleVerifier.
+_DEFAULT_MERKLE_VERIFIER = merkle.MerkleVerifier()
+
 def decode_signature(signature):
     """Decode the TLS-encoded serialized signature.
 
@@ -34,30 +44,22 @@ def decode_signature(signature):
         ct.crypto.error.EncodingError: invalid TLS encoding.
     """
 
-    sig_stream = io.BytesIO(signature)
-
-    sig_prefix = sig_stream.read(2)
-    if len(sig_prefix) != 2:
-        raise error.EncodingError("Invalid algorithm prefix %s" %
-                                      sig_prefix.encode("hex"))
-    hash_algo, sig_algo = struct.unpack(">BB", sig_prefix)
+    if len(signature) < _SIG_PREFIX.size:
+        raise error.EncodingError("Invalid signature prefix %s" %
+                                  signature.encode("hex"))
+    hash_algo, sig_algo, sig_length = _SIG_PREFIX.unpack_from(signature)
     if (hash_algo != ct_pb2.DigitallySigned.SHA256 or
         sig_algo not in SUPPORTED_SIGNATURE_ALGORITHMS):
         raise error.EncodingError("Invalid algorithm(s) %d, %d" %
                                   (hash_algo, sig_algo))
 
-    length_prefix = sig_stream.read(2)
-    if len(length_prefix) != 2:
-        raise error.EncodingError("Invalid signature length prefix %s" %
-                                  length_prefix.encode("hex"))
-    sig_length, = struct.unpack(">H", length_prefix)
-    remaining = sig_stream.read()
-    if len(remaining) != sig_length:
+    if len(signature) - _SIG_PREFIX.size != sig_length:
         raise error.EncodingError("Invalid signature length %d for "
                                   "signature %s with length %d" %
-                                  (sig_length, remaining.encode("hex"),
-                                   len(remaining)))
-    return (hash_algo, sig_algo, remaining)
+                                  (sig_length,
+                                   signature[_SIG_PREFIX.size:].encode("hex"),
+                                   len(signature) - _SIG_PREFIX.size))
+    return (hash_algo, sig_algo, signature[_SIG_PREFIX.size:])
 
 def _get_precertificate_issuer(chain):
     try:
@@ -186,10 +188,22 @@ def _create_dst_entry(sct, chain):
 
 
 class LogVerifier(object):
-    """CT log verifier."""
+    """CT log verifier.
+
+    The log's public key is parsed once, on construction, and kept in the
+    form used by the signature backend. Create one LogVerifier per log and
+    reuse it for all of that log's STHs and SCTs rather than constructing a
+    new one for each verification.
+    """
+
+    def __init__(self, key_info, merkle_verifier=None):
+        """Initialize from KeyInfo protocol buffer and a MerkleVerifier.
 
-    def __init__(self, key_info, merkle_verifier=merkle.MerkleVerifier()):
-        """Initialize from KeyInfo protocol buffer and a MerkleVerifier."""
+        If no MerkleVerifier is given, a module-wide default is used.
+        MerkleVerifier holds no per-tree state, so sharing it is safe.
+        """
+        if merkle_verifier is None:
+            merkle_verifier = _DEFAULT_MERKLE_VERIFIER
         self.__merkle_verifier = merkle_verifier
         if (key_info.type == client_pb2.KeyInfo.ECDSA):
             self.__sig_verifier = verify_ecdsa.EcdsaVerifier(key_info)
@@ -206,9 +220,9 @@ class LogVerifier(object):
         if len(sth_response.sha256_root_hash) != 32:
             raise error.EncodingError("Wrong hash length: expected 32, got %d" %
                                       len(sth_response.sha256_root_hash))
-        return struct.pack(">BBQQ32s", ct_pb2.V1, ct_pb2.TREE_HEAD,
-                           sth_response.timestamp, sth_response.tree_size,
-                           sth_response.sha256_root_hash)
+        return _STH_INPUT.pack(ct_pb2.V1, ct_pb2.TREE_HEAD,
+                               sth_response.timestamp, sth_response.tree_size,
+                               sth_response.sha256_root_hash)
 
     @error.returns_true_or_raises
     def _assert_correct_signature_algorithms(self, hash_algo, sig_algo):
@@ -252,6 +266,43 @@ class LogVerifier(object):
 
         return self.__sig_verifier.verify(signature_input, signature)
 
+    @error.returns_true_or_raises
+    def verify_sths(self, sth_responses):
+        """Verify a batch of STH Responses from this log.
+
+        All signature inputs are encoded, and all signatures decoded and
+        checked against the log's algorithms, before any signature is verified,
+        so malformed responses are rejected without doing any public key
+        operations.
+
+        Args:
+            sth_responses: iterable of client_pb2.SthResponse protos. The
+                responses must have all fields present.
+
+        Returns:
+            True. The return value is enforced by a decorator and need not be
+                checked by the caller.
+
+        Raises:
+            ct.crypto.error.EncodingError: failed to encode signature input,
+                or decode the signature.
+            ct.crypto.error.SignatureError: invalid signature.
+        """
+        sth_responses = list(sth_responses)
+        signature_inputs = [self._encode_sth_input(sth_response)
+                            for sth_response in sth_responses]
+        signatures = []
+        for sth_response in sth_responses:
+            (hash_algo, sig_algo, signature) = decode_signature(
+                sth_response.tree_head_signature)
+            self._assert_correct_signature_algorithms(hash_algo, sig_algo)
+            signatures.append(signature)
+
+        verify = self.__sig_verifier.verify
+        for signature_input, signature in zip(signature_inputs, signatures):
+            verify(signature_input, signature)
+        return True
+
     @staticmethod
     @error.returns_true_or_raises
     def verify_sth_temporal_consistency(old_sth, new_sth):
@@ -273,19 +324,22 @@ class LogVerifier(object):
             ct.crypto.error.ConsistencyError: STHs are inconsistent
             ValueError: "Older" STH is not older.
         """
-        if old_sth.timestamp > new_sth.timestamp:
+        old_timestamp, new_timestamp = old_sth.timestamp, new_sth.timestamp
+        old_size, new_size = old_sth.tree_size, new_sth.tree_size
+
+        if old_timestamp > new_timestamp:
             raise ValueError("Older STH has newer timestamp (%d vs %d), did "
                              "you supply inputs in the wrong order?" %
-                             (old_sth.timestamp, new_sth.timestamp))
+                             (old_timestamp, new_timestamp))
 
-        if (old_sth.timestamp == new_sth.timestamp and
-            old_sth.tree_size != new_sth.tree_size):
+        if old_timestamp == new_timestamp and old_size != new_size:
             # Issuing two different STHs for the same timestamp is illegal,
             # even if they are otherwise consistent.
             raise error.ConsistencyError("Inconsistency: different tree sizes "
                                          "for the same timestamp")
-        if (old_sth.timestamp < new_sth.timestamp and
-            old_sth.tree_size > new_sth.tree_size):
+        # Timestamps are now either strictly increasing, or equal with equal
+        # tree sizes, so there is no need to compare them again.
+        if old_size > new_size:
             raise error.ConsistencyError("Inconsistency: older tree has bigger "
                                          "size")
         return True
@@ -313,6 +367,16 @@ class LogVerifier(object):
             ValueError: "Older" STH is not older.
         """
         self.verify_sth_temporal_consistency(old_sth, new_sth)
+        # A log that has not grown must report the same root hash; there is
+        # nothing for the Merkle verifier to do. This mirrors the equal-size
+        # case of MerkleVerifier.verify_tree_consistency.
+        if old_sth.tree_size == new_sth.tree_size:
+            if old_sth.sha256_root_hash != new_sth.sha256_root_hash:
+                raise error.ConsistencyError("Inconsistency: different root "
+                                             "hashes for the same tree size")
+            if proof:
+                logging.warning("Trees are identical, ignoring proof")
+            return True
         self.__merkle_verifier.verify_tree_consistency(
             old_sth.tree_size, new_sth.tree_size, old_sth.sha256_root_hash,
             new_sth.sha256_root_hash, proof)
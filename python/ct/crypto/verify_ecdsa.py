@@ -3,8 +3,11 @@ from ct.crypto import pem
 from ct.crypto.asn1 import types
 from ct.proto import client_pb2
 
-import hashlib
-import ecdsa
+from cryptography import exceptions
+from cryptography.hazmat import backends
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
 
 class _ECDSASignature(types.Sequence):
     components = (
@@ -24,6 +27,8 @@ class EcdsaVerifier(object):
     __READ_MARKERS = ("PUBLIC KEY", "ECDSA PUBLIC KEY")
     # A marker to write when writing a PEM-encoded ECDSA public key."""
     __WRITE_MARKER = "ECDSA PUBLIC KEY"
+    # The signature scheme passed to the key on each verification.
+    __SIGNATURE_SCHEME = ec.ECDSA(hashes.SHA256())
 
     def __init__(self, key_info):
         """Creates a verifier that uses a PEM-encoded ECDSA public key.
@@ -41,9 +46,13 @@ class EcdsaVerifier(object):
         # Will raise a PemError on invalid encoding
         self.__der, _ = pem.from_pem(key_info.pem_key, self.__READ_MARKERS)
         try:
-            self.__key = ecdsa.VerifyingKey.from_der(self.__der)
-        except ecdsa.der.UnexpectedDER as e:
+            self.__key = serialization.load_der_public_key(
+                self.__der, backend=backends.default_backend())
+        except (ValueError, exceptions.UnsupportedAlgorithm) as e:
             raise error.EncodingError(e)
+        if not isinstance(self.__key, ec.EllipticCurvePublicKey):
+            raise error.UnsupportedAlgorithmError(
+                "Expected ECDSA key, but got %s" % type(self.__key).__name__)
 
     def __repr__(self):
         return "%s(public key: %r)" % (self.__class__.__name__,
@@ -65,15 +74,21 @@ class EcdsaVerifier(object):
         - error.EncodingError: If the signature encoding is invalid.
         - error.SignatureError: If the signature fails verification.
         """
+        try:
+            self.__key.verify(signature, signature_input,
+                              self.__SIGNATURE_SCHEME)
+            return True
+        except exceptions.InvalidSignature:
+            pass
+
+        # OpenSSL only accepts strict DER, so a signature that verifies is
+        # well-formed. Decode it only on failure, to tell an invalid encoding
+        # apart from a bad signature.
         try:
             _ECDSASignature.decode(signature)
-            return self.__key.verify(signature, signature_input,
-                                     hashfunc=hashlib.sha256,
-                                     sigdecode=ecdsa.util.sigdecode_der)
-        except (ecdsa.der.UnexpectedDER, error.ASN1Error) as e:
+        except error.ASN1Error as e:
             raise error.EncodingError("Invalid DER encoding for signature %s",
                                       signature.encode("hex"), e)
-        except ecdsa.keys.BadSignatureError:
-            raise error.SignatureError("Signature did not verify: %s",
-                                       signature.encode("hex"))
+        raise error.SignatureError("Signature did not verify: %s",
+                                   signature.encode("hex"))
 
@@ -2,9 +2,12 @@ from ct.crypto import error
 from ct.crypto import pem
 from ct.proto import client_pb2
 
-import Crypto.Hash.SHA256
-import Crypto.PublicKey.RSA
-import Crypto.Signature.PKCS1_v1_5
+from cryptography import exceptions
+from cryptography.hazmat import backends
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import rsa
 
 class RsaVerifier(object):
     """Verifies RSA signatures."""
@@ -18,6 +21,9 @@ class RsaVerifier(object):
     __READ_MARKERS = ("PUBLIC KEY", "RSA PUBLIC KEY")
     # A marker to write when writing a PEM-encoded RSA public key.
     __WRITE_MARKER = "RSA PUBLIC KEY"
+    # The padding and hash passed to the key on each verification.
+    __PADDING = padding.PKCS1v15()
+    __HASH = hashes.SHA256()
 
     def __init__(self, key_info):
         """Creates a verifier that uses a PEM-encoded RSA public key.
@@ -35,9 +41,13 @@ class RsaVerifier(object):
         # Will raise a PemError on invalid encoding
         self.__der, _ = pem.from_pem(key_info.pem_key, self.__READ_MARKERS)
         try:
-            self.__key = Crypto.PublicKey.RSA.importKey(self.__der)
-        except (ValueError, IndexError, TypeError) as e:
+            self.__key = serialization.load_der_public_key(
+                self.__der, backend=backends.default_backend())
+        except (ValueError, exceptions.UnsupportedAlgorithm) as e:
             raise error.EncodingError(e)
+        if not isinstance(self.__key, rsa.RSAPublicKey):
+            raise error.UnsupportedAlgorithmError(
+                "Expected RSA key, but got %s" % type(self.__key).__name__)
 
     def __repr__(self):
         return "%s(public key: %r)" % (self.__class__.__name__,
@@ -58,12 +68,11 @@ class RsaVerifier(object):
         Raises:
         - error.SignatureError: If the signature fails verification.
         """
-        verifier = Crypto.Signature.PKCS1_v1_5.new(self.__key)
-        sha256_hash = Crypto.Hash.SHA256.new(signature_input)
-
-        if verifier.verify(sha256_hash, signature):
+        try:
+            self.__key.verify(signature, signature_input, self.__PADDING,
+                              self.__HASH)
             return True
-        else:
+        except exceptions.InvalidSignature:
             raise error.SignatureError("Signature did not verify: %s",
                                        signature.encode("hex"))
 
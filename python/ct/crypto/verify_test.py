@@ -11,6 +11,8 @@ from ct.crypto import cert
 from ct.crypto import error
 from ct.crypto import pem
 from ct.crypto import verify
+from ct.crypto import verify_ecdsa
+from ct.crypto import verify_rsa
 from ct.proto import client_pb2
 from ct.serialization import tls_message
 import mock
@@ -75,6 +77,51 @@ class LogVerifierTest(object):
             self.assertRaises((error.EncodingError, error.SignatureError),
                               verifier.verify_sth, sth)
 
+    def test_verify_sths(self):
+        verifier = verify.LogVerifier(self.key_info_fixture)
+        self.assertTrue(verifier.verify_sths([self.sth_fixture] * 3))
+        self.assertTrue(verifier.verify_sths([]))
+
+    def test_verify_sths_fails_for_bad_signature(self):
+        verifier = verify.LogVerifier(self.key_info_fixture)
+        sth = client_pb2.SthResponse()
+        sth.CopyFrom(self.sth_fixture)
+        sth.timestamp += 1
+        self.assertRaises(error.SignatureError, verifier.verify_sths,
+                          [self.sth_fixture, sth, self.sth_fixture])
+
+    def test_verify_sths_checks_all_encodings_before_verifying(self):
+        verifier = verify.LogVerifier(self.key_info_fixture)
+
+        bad_hash = client_pb2.SthResponse()
+        bad_hash.CopyFrom(self.sth_fixture)
+        bad_hash.sha256_root_hash = "too short"
+
+        truncated = client_pb2.SthResponse()
+        truncated.CopyFrom(self.sth_fixture)
+        truncated.tree_head_signature = (
+            self.sth_fixture.tree_head_signature[:-1])
+
+        # Swap ECDSA for RSA or vice versa: the signature is well-formed but
+        # does not match the log key.
+        wrong_algorithm = client_pb2.SthResponse()
+        wrong_algorithm.CopyFrom(self.sth_fixture)
+        sig_algo = ord(self.sth_fixture.tree_head_signature[1])
+        wrong_algorithm.tree_head_signature = (
+            self.sth_fixture.tree_head_signature[:1] +
+            chr(sig_algo ^ (client_pb2.DigitallySigned.RSA ^
+                            client_pb2.DigitallySigned.ECDSA)) +
+            self.sth_fixture.tree_head_signature[2:])
+
+        with mock.patch.object(verify_ecdsa.EcdsaVerifier, "verify") as ecdsa, \
+            mock.patch.object(verify_rsa.RsaVerifier, "verify") as rsa:
+            for sth in (bad_hash, truncated, wrong_algorithm):
+                self.assertRaises((error.EncodingError, error.SignatureError),
+                                  verifier.verify_sths,
+                                  [self.sth_fixture, self.sth_fixture, sth])
+            self.assertFalse(ecdsa.called)
+            self.assertFalse(rsa.called)
+
     def test_verify_sth_consistency(self):
         old_sth = self.sth_fixture
         new_sth = client_pb2.SthResponse()
@@ -95,6 +142,29 @@ class LogVerifierTest(object):
             old_sth.tree_size, new_sth.tree_size, old_sth.sha256_root_hash,
             new_sth.sha256_root_hash, proof)
 
+    def test_verify_sth_consistency_same_tree_size(self):
+        old_sth = self.sth_fixture
+        new_sth = client_pb2.SthResponse()
+        new_sth.CopyFrom(old_sth)
+        new_sth.timestamp = old_sth.timestamp + 1
+
+        mock_merkle_verifier = mock.Mock()
+        verifier = verify.LogVerifier(self.key_info_fixture,
+                                      mock_merkle_verifier)
+        with mock.patch.object(verify.logging, "warning") as mock_warning:
+            self.assertTrue(verifier.verify_sth_consistency(old_sth, new_sth,
+                                                            []))
+            self.assertFalse(mock_warning.called)
+            self.assertTrue(verifier.verify_sth_consistency(
+                old_sth, new_sth, ["a proof that should be empty"]))
+            self.assertTrue(mock_warning.called)
+
+        new_sth.sha256_root_hash = "a new hash"
+        self.assertRaises(error.ConsistencyError,
+                          verifier.verify_sth_consistency, old_sth, new_sth,
+                          [])
+        self.assertFalse(mock_merkle_verifier.verify_tree_consistency.called)
+
     def test_verify_sth_temporal_consistency(self):
         old_sth = self.sth_fixture
         new_sth = client_pb2.SthResponse()
@@ -353,8 +423,9 @@ class LogVerifierEcdsaTest(LogVerifierTest, unittest.TestCase):
         self.assertRaises(error.EncodingError, verifier.verify_sth, sth)
 
         # Increasing the length means there are not enough ASN.1 bytes left to
-        # decode the sequence, however the ecdsa module silently slices it.
-        # Our ECDSA verifier checks for it and will fail.
+        # decode the sequence. OpenSSL rejects the signature, and our ECDSA
+        # verifier reports it as an encoding error rather than a bad
+        # signature.
         sth = client_pb2.SthResponse()
         sth.CopyFrom(sth_fixture)
         sth.tree_head_signature = (
@@ -483,6 +554,29 @@ class CreateKeyInfoTest(unittest.TestCase):
         self.assertTrue('PUBLIC KEY' in key_info.pem_key)
 
 
+class DecodeSignatureTest(unittest.TestCase):
+    def test_decode_signature(self):
+        self.assertEqual(
+            verify.decode_signature("\x04\x03\x00\x03abc"),
+            (client_pb2.DigitallySigned.SHA256,
+             client_pb2.DigitallySigned.ECDSA, "abc"))
+
+    def test_decode_signature_truncated_prefix(self):
+        for signature in ("", "\x04", "\x04\x03", "\x04\x03\x00"):
+            self.assertRaises(error.EncodingError, verify.decode_signature,
+                              signature)
+
+    def test_decode_signature_wrong_length(self):
+        self.assertRaises(error.EncodingError, verify.decode_signature,
+                          "\x04\x03\x00\x03ab")
+        self.assertRaises(error.EncodingError, verify.decode_signature,
+                          "\x04\x03\x00\x03abcd")
+
+    def test_decode_signature_unsupported_algorithm(self):
+        self.assertRaises(error.EncodingError, verify.decode_signature,
+                          "\x02\x03\x00\x03abc")
+
+
 if __name__ == "__main__":
     sys.argv = FLAGS(sys.argv)
     unittest.main()
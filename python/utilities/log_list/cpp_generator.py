@@ -1,7 +1,8 @@
 import datetime
-import base64
 import hashlib
-import math
+
+# C escape sequence for each byte value, e.g. \x0a for 10.
+_HEX_ESCAPES = ["\\x%.2x" % i for i in range(256)]
 
 def _write_cpp_header(f, include_guard):
     year = datetime.date.today().year
@@ -28,12 +29,12 @@ def _write_log_info_struct_definition(f):
 
 
 def split_and_hexify_binary_data(bin_data):
-    hex_data = "".join(["\\x%.2x" % ord(c) for c in bin_data])
+    hex_data = "".join(map(_HEX_ESCAPES.__getitem__, bytearray(bin_data)))
     # line_width % 4 must be 0 to avoid splitting the hex-encoded data
     # across '\' which will escape the quotation marks.
     line_width = 68
     assert line_width % 4 == 0
-    num_splits = int(math.ceil(len(hex_data) / float(line_width)))
+    num_splits = (len(hex_data) + line_width - 1) // line_width
     return ['"%s"' % hex_data[i * line_width:(i + 1) * line_width]
             for i in range(num_splits)]
 
@@ -76,14 +77,17 @@ def generate_cpp_header(json_log_list, output_file):
     google_operator_id = _find_google_operator_id(json_log_list)
     google_log_ids = []
     for log in logs:
-        log_key = base64.decodestring(log["key"])
+        log_key = log["_key_bytes"]
         split_hex_key = split_and_hexify_binary_data(log_key)
-        s = "    {"
-        s += "\n     ".join(split_hex_key)
-        s += ',\n     %d' % (len(log_key))
-        s += ',\n     "%s"' % (log["description"])
-        s += ',\n     "https://%s/"}' % (log["url"])
-        list_code.append(s)
+        list_code.append(
+            '    {%(key)s,\n'
+            '     %(key_length)d,\n'
+            '     "%(description)s",\n'
+            '     "https://%(url)s/"}' %
+            {"key": "\n     ".join(split_hex_key),
+             "key_length": len(log_key),
+             "description": log["description"],
+             "url": log["url"]})
 
         # operated_by is a list, in practice we have not witnessed
         # a log co-operated by more than one operator. Ensure we take this
@@ -1,6 +1,9 @@
 import datetime
 import textwrap
-import base64
+
+# Java (signed) byte literal for each byte value, e.g. -1 for 255.
+_SIGNED_BYTE_LITERALS = ["%d" % (u - 256 if u > 127 else u)
+                         for u in range(256)]
 
 def _write_java_header(output, package):
     year = datetime.date.today().year
@@ -27,9 +30,8 @@ def _write_java_header(output, package):
          "package": package})
 
 def _encode_key(description, key):
-    unsigned = (ord(c) for c in key)
-    signed = (u - 256 if u > 127 else u for u in unsigned)
-    array = textwrap.fill(", ".join("%d" % s for s in signed),
+    literals = map(_SIGNED_BYTE_LITERALS.__getitem__, bytearray(key))
+    array = textwrap.fill(", ".join(literals),
                           width=85,
                           initial_indent="    " * 3,
                           subsequent_indent="    " * 3)
@@ -45,8 +47,7 @@ def _encode_key(description, key):
 def _write_java_class(output, logs, class_name):
     descriptions = ('        "%s",\n' % log["description"] for log in logs)
     urls = ('        "%s",\n' % log["url"] for log in logs)
-    keys = (_encode_key(log["description"], base64.decodestring(log["key"]))
-            for log in logs)
+    keys = (_encode_key(log["description"], log["_key_bytes"]) for log in logs)
 
     output.write(
         "public final class %(class_name)s {\n"
@@ -10,7 +10,11 @@ import time
 
 import gflags
 import jsonschema
-import M2Crypto
+from cryptography import exceptions
+from cryptography.hazmat import backends
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding
 
 from cpp_generator import generate_cpp_header
 from java_generator import generate_java_source
@@ -38,26 +42,39 @@ gflags.DEFINE_boolean("skip_signature_check", False,
                      "Skip signature check (only validate schema).")
 
 
+# Schema validators, keyed by schema file name.
+_SCHEMA_VALIDATORS = {}
+
+
+def _get_schema_validator(schema_file):
+    if schema_file not in _SCHEMA_VALIDATORS:
+        with open(schema_file, "rb") as f:
+            schema = json.load(f)
+        jsonschema.Draft4Validator.check_schema(schema)
+        _SCHEMA_VALIDATORS[schema_file] = jsonschema.Draft4Validator(schema)
+    return _SCHEMA_VALIDATORS[schema_file]
+
+
 def is_log_list_valid(json_log_list, schema_file):
-    try:
-        jsonschema.validate(
-            json_log_list,
-            json.load(open(schema_file, "rb")))
-        return True
-    except jsonschema.exceptions.ValidationError as e:
+    validator = _get_schema_validator(schema_file)
+    errors = list(validator.iter_errors(json_log_list))
+    for e in errors:
         print e
-        return False
-    return False
+    return not errors
 
 
 def is_signature_valid(log_list_data, signature_file, public_key_file):
-    loaded_pubkey = M2Crypto.RSA.load_pub_key(public_key_file)
-    pubkey = M2Crypto.EVP.PKey()
-    pubkey.assign_rsa(loaded_pubkey)
-    pubkey.reset_context(md="sha256")
-    pubkey.verify_init()
-    pubkey.verify_update(log_list_data)
-    return pubkey.verify_final(open(signature_file, "rb").read())
+    with open(public_key_file, "rb") as f:
+        pubkey = serialization.load_pem_public_key(
+            f.read(), backend=backends.default_backend())
+    with open(signature_file, "rb") as f:
+        signature = f.read()
+    try:
+        pubkey.verify(signature, log_list_data, padding.PKCS1v15(),
+                      hashes.SHA256())
+        return True
+    except exceptions.InvalidSignature:
+        return False
 
 
 def print_formatted_log_list(json_log_list):
@@ -73,11 +90,8 @@ def print_formatted_log_list(json_log_list):
             ", ".join(log_operators),
             log_info["maximum_merge_delay"] / (60.0 ** 2))
         print "  At: %s" % (log_info["url"])
-        key = base64.decodestring(log_info["key"])
-        hasher = hashlib.sha256()
-        hasher.update(key)
-        key_hash = hasher.digest()
-        print "  Key ID: %s" % (base64.encodestring(key_hash)),
+        key_hash = hashlib.sha256(log_info["_key_bytes"]).digest()
+        print "  Key ID: %s" % (base64.b64encode(key_hash))
         if "final_sth" in log_info:
             final_sth = log_info["final_sth"]
             print "  Log is frozen as of %s, final tree size %d" % (
@@ -85,6 +99,13 @@ def print_formatted_log_list(json_log_list):
                 final_sth["tree_size"])
         print "-" * 80
 
+
+def decode_log_keys(json_log_list):
+    """Decode each log's base64 key once, storing it as "_key_bytes"."""
+    for log_info in json_log_list["logs"]:
+        log_info["_key_bytes"] = base64.b64decode(log_info["key"])
+
+
 def run():
     with open(FLAGS.log_list, "rb") as f:
         json_data = f.read()
@@ -98,6 +119,7 @@ def run():
     if not is_log_list_valid(parsed_json, FLAGS.log_list_schema):
         print "ERROR: Log list is signed but does not conform to the schema."
         sys.exit(2)
+    decode_log_keys(parsed_json)
     if FLAGS.header_output:
         generate_cpp_header(parsed_json, FLAGS.header_output)
     if FLAGS.java_output: